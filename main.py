@@ -7,22 +7,35 @@ Blade Arena — Refactored single-file game
 
 Requirements:
 pip install pygame opencv-python numpy
+(optional) pip install numba  -- JIT-compiles the pickup/combat step
 """
 
 import pygame
 import cv2
+import numpy as np
 import os
 import json
 import random
 import math
 import time
+import threading
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        # numba not installed: kernels run as plain Python
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 # ---------------- Config ----------------
 W, H = 1000, 660
 ASSETS = "assets"
 DB = "players.json"
+DB_INDENT = 2  # pretty-print players.json; None writes it compact
 FPS = 60
 AVATAR_SIZE = 96
 Path(ASSETS).mkdir(parents=True, exist_ok=True)
@@ -53,68 +66,158 @@ def init_db():
         with open(DB, "w") as f:
             json.dump({"players": []}, f)
 
-def load_db():
+_PLAYERS_CACHE = None  # in-memory copy of the DB, read from disk on first use
+_LAST_SERIALIZED = None  # serialized DB as last loaded/saved, to skip no-op saves
+
+def get_players():
+    if _PLAYERS_CACHE is None:
+        reload_players()
+    return _PLAYERS_CACHE
+
+def reload_players():
+    global _PLAYERS_CACHE, _LAST_SERIALIZED
     init_db()
     with open(DB, "r") as f:
-        return json.load(f)["players"]
+        _PLAYERS_CACHE = json.load(f)["players"]
+    # compare saves against our own serialization, not the raw file (line endings may differ)
+    _LAST_SERIALIZED = json.dumps({"players": _PLAYERS_CACHE}, indent=DB_INDENT).encode("utf-8")
+    return _PLAYERS_CACHE
+
+def load_db():
+    return get_players()
 
 def save_db(players_list):
-    with open(DB, "w") as f:
-        json.dump({"players": players_list}, f, indent=2)
+    global _LAST_SERIALIZED
+    data = json.dumps({"players": players_list}, indent=DB_INDENT).encode("utf-8")
+    if data == _LAST_SERIALIZED:
+        return
+    # write-then-rename so a crash mid-write can't corrupt the DB
+    tmp = DB + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, DB)
+    _LAST_SERIALIZED = data
 
 def add_player_record(name, img_path):
-    players = load_db()
+    players = get_players()
     players.append({"name": name, "photo": img_path, "created": datetime.now().isoformat()})
     save_db(players)
 
 def delete_player_record_by_photo(photo_path):
-    players = load_db()
-    players = [p for p in players if p.get("photo") != photo_path]
-    save_db(players)
+    global _PLAYERS_CACHE
+    _PLAYERS_CACHE = [p for p in get_players() if p.get("photo") != photo_path]
+    save_db(_PLAYERS_CACHE)
 
 # ---------------- Face capture (passport style) ----------------
 face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+DETECT_SCALE = 0.5  # run the cascade on a downscaled frame
+DETECT_EVERY = 2    # and only on every Nth frame, reusing the last boxes in between
+
+class CameraCapture(threading.Thread):
+    """Reads the webcam and runs face detection off the main thread."""
+    def __init__(self, index=0):
+        super().__init__(daemon=True)
+        self.cam = cv2.VideoCapture(index)
+        if not self.cam.isOpened():
+            raise RuntimeError("Could not open webcam.")
+        self.cam.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        self.cam.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        self.lock = threading.Lock()
+        self.latest_frame = None  # BGR preview with the crop box drawn
+        self.latest_face = None   # last passport-style crop seen
+        self._stop_evt = threading.Event()
+
+    def run(self):
+        frame_idx = 0
+        faces = []
+        while not self._stop_evt.is_set():
+            ret, frame = self.cam.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            h, w, _ = frame.shape
+            if frame_idx % DETECT_EVERY == 0:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                small = cv2.resize(gray, (0,0), fx=DETECT_SCALE, fy=DETECT_SCALE)
+                faces = [tuple(int(v / DETECT_SCALE) for v in f) for f in face_cascade.detectMultiScale(small, 1.15, 5)]
+            frame_idx += 1
+            display = frame.copy()
+            face_img = None
+            for (x,y,fw,fh) in sorted(faces, key=lambda f: f[2]*f[3], reverse=True)[:1]:
+                pad_w = int(fw * 0.7)
+                pad_h = int(fh * 1.0)
+                x1 = max(0, x - pad_w); y1 = max(0, y - pad_h)
+                x2 = min(w, x + fw + pad_w); y2 = min(h, y + fh + pad_h)
+                cv2.rectangle(display, (x1,y1), (x2,y2), (0,200,0), 2)
+                face_img = frame[y1:y2, x1:x2]
+            with self.lock:
+                self.latest_frame = display
+                if face_img is not None:
+                    self.latest_face = face_img
+        self.cam.release()
+
+    def snapshot(self):
+        with self.lock:
+            return self.latest_frame, self.latest_face
+
+    def stop(self):
+        self._stop_evt.set()
+        self.join(timeout=1.0)
+
 def capture_and_crop(name, out_path, preview_window_title="Capture Face (SPACE to take, ESC to cancel)"):
-    cam = cv2.VideoCapture(0)
-    if not cam.isOpened():
-        raise RuntimeError("Could not open webcam.")
-    face_img = None
+    cam = CameraCapture(0)
+    cam.start()
+    saved = False
     start = time.time()
-    while True:
-        ret, frame = cam.read()
-        if not ret:
-            continue
-        h, w, _ = frame.shape
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, 1.15, 5)
-        display = frame.copy()
-        faces = sorted(list(faces), key=lambda f: f[2]*f[3], reverse=True) if len(faces) else []
-        for (x,y,fw,fh) in faces[:1]:
-            pad_w = int(fw * 0.7)
-            pad_h = int(fh * 1.0)
-            x1 = max(0, x - pad_w); y1 = max(0, y - pad_h)
-            x2 = min(w, x + fw + pad_w); y2 = min(h, y + fh + pad_h)
-            cv2.rectangle(display, (x1,y1), (x2,y2), (0,200,0), 2)
-            face_img = frame[y1:y2, x1:x2]
-        cv2.putText(display, preview_window_title, (10,30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (220,220,220), 1, cv2.LINE_AA)
-        cv2.imshow(preview_window_title, display)
-        key = cv2.waitKey(1)
-        if key == 27:  # ESC
-            face_img = None
-            break
-        if key == 32 and face_img is not None:  # SPACE
-            face_img = cv2.resize(face_img, (256,256))
-            cv2.imwrite(out_path, face_img)
-            break
-        # safety fallback (if camera freezes) after 90s
-        if time.time() - start > 90:
-            break
-    cam.release()
-    cv2.destroyAllWindows()
-    return face_img is not None
+    try:
+        while True:
+            clock.tick(30)
+            done = False
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    cam.stop(); pygame.quit(); exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        done = True
+                    elif event.key == pygame.K_SPACE:
+                        face_img = cam.snapshot()[1]
+                        if face_img is not None:
+                            cv2.imwrite(out_path, cv2.resize(face_img, (256,256)))
+                            saved = done = True
+            # safety fallback (if camera freezes) after 90s
+            if done or time.time() - start > 90:
+                break
+            # preview
+            frame, _ = cam.snapshot()
+            screen.fill((10,12,18))
+            draw_text_center(screen, preview_window_title, 24, font=FONT)
+            if frame is not None:
+                h, w, _ = frame.shape
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                preview = pygame.image.frombuffer(rgb.tobytes(), (w, h), "RGB")
+                scale = min(1.0, (W - 40) / w, (H - 80) / h)
+                if scale < 1.0:
+                    preview = pygame.transform.scale(preview, (int(w * scale), int(h * scale)))
+                screen.blit(preview, preview.get_rect(center=(W//2, H//2 + 20)))
+            pygame.display.update()
+    finally:
+        cam.stop()
+    return saved
 
 # ---------------- Avatar helper ----------------
+_AVATAR_CACHE = {}  # (path, size) -> display-format avatar Surface
+
 def make_circular_avatar(path, size=AVATAR_SIZE):
+    key = (path, size)
+    if key not in _AVATAR_CACHE:
+        _AVATAR_CACHE[key] = _build_circular_avatar(path, size)
+    return _AVATAR_CACHE[key]
+
+def forget_avatar(path):
+    for key in [k for k in _AVATAR_CACHE if k[0] == path]:
+        del _AVATAR_CACHE[key]
+
+def _build_circular_avatar(path, size):
     surf = pygame.image.load(path).convert_alpha()
     surf = pygame.transform.smoothscale(surf, (size, size))
     mask = pygame.Surface((size, size), pygame.SRCALPHA)
@@ -122,7 +225,7 @@ def make_circular_avatar(path, size=AVATAR_SIZE):
     out = pygame.Surface((size, size), pygame.SRCALPHA)
     out.blit(surf, (0,0))
     out.blit(mask, (0,0), special_flags=pygame.BLEND_RGBA_MIN)
-    return out
+    return out.convert_alpha()  # match display format so blits skip conversion
 
 # ---------------- UI primitives ----------------
 def rounded_rect(surface, rect, color, radius=12, border=0, border_color=(0,0,0)):
@@ -130,13 +233,23 @@ def rounded_rect(surface, rect, color, radius=12, border=0, border_color=(0,0,0)
     if border:
         pygame.draw.rect(surface, border_color, rect, width=border, border_radius=radius)
 
-def draw_text(surface, text, pos, font=FONT, color=(245,245,245)):
-    surface.blit(font.render(text, True, color), pos)
+def rounded_surface(size, color, radius=12, border=0, border_color=(0,0,0)):
+    # pre-rendered rounded_rect for blitting; corners stay transparent
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    rounded_rect(surf, surf.get_rect(), color, radius=radius, border=border, border_color=border_color)
+    return surf
 
 def draw_text_center(surface, text, y, font=BIG, color=(245,245,245)):
     txt = font.render(text, True, color)
     surface.blit(txt, (W//2 - txt.get_width()//2, y))
 
+def blit_batch(surface, seq):
+    # Surface.fblits only exists in pygame-ce; stock pygame always takes the blits fallback
+    if hasattr(surface, "fblits"):
+        surface.fblits(seq)
+    else:
+        surface.blits(seq, doreturn=False)
+
 def draw_triangle(surface, x, y, size, color):
     h = size * 0.866
     points = [(x, y - 2*h/3), (x - size/2, y + h/3), (x + size/2, y + h/3)]
@@ -151,6 +264,62 @@ def draw_heart(surface, x, y, size, color):
     pts = [(x - size, y), (x + size, y), (x, y + int(size*1.15))]
     pygame.draw.polygon(surface, color, pts)
 
+# ---------------- Cached sprites ----------------
+def make_sprite(draw_fn, size, color):
+    # rasterize a centered primitive once; blit at (x - half, y - half)
+    half = int(size * 1.15) + 2
+    surf = pygame.Surface((half*2, half*2), pygame.SRCALPHA)
+    draw_fn(surf, half, half, size, color)
+    return surf
+
+def sprite_pos(sprite, x, y):
+    return (x - sprite.get_width()//2, y - sprite.get_height()//2)
+
+BLADE_SIZE = 34
+HEALTH_SIZE = 22
+HEART_HP = make_sprite(draw_heart, 14, (235,60,60))
+HEART_PICKUP = make_sprite(draw_heart, HEALTH_SIZE, (220,40,40))
+BLADE_PICKUP = make_sprite(draw_triangle, BLADE_SIZE, (245,245,245))
+# HUD heart slots, index i = i-th heart for each player
+HP_SLOTS = (
+    [sprite_pos(HEART_HP, 24 + i*34 + 2, 70) for i in range(5)],
+    [sprite_pos(HEART_HP, W - (i + 1) * 34 - 24, 70) for i in range(5)],
+)
+
+AURA_SIZE = 180
+AURA_STEP = 6  # degrees the aura rotates per frame
+# whole-degree trig lookup tables
+AURA_COS = [math.cos(math.radians(a)) for a in range(360)]
+AURA_SIN = [math.sin(math.radians(a)) for a in range(360)]
+
+def make_aura(angle):
+    aura = pygame.Surface((AURA_SIZE, AURA_SIZE), pygame.SRCALPHA)
+    cx, cy = AURA_SIZE//2, AURA_SIZE//2
+    inner_r, outer_r = 36, 72
+    for k in range(6):
+        a = (angle + k*60) % 360
+        c, s = AURA_COS[a], AURA_SIN[a]
+        dx1 = int(inner_r * c); dy1 = int(inner_r * s)
+        dx2 = int(outer_r * c); dy2 = int(outer_r * s)
+        pygame.draw.polygon(aura, (200,24,24,140), [(cx,cy),(cx+dx1,cy+dy1),(cx+dx2,cy+dy2)])
+    pygame.draw.circle(aura, (255,120,120,120), (cx,cy), 12)
+    return aura
+
+# 6-fold symmetric, so only 60/AURA_STEP unique rotations
+AURA_FRAMES = tuple(make_aura(k * AURA_STEP) for k in range(60 // AURA_STEP))
+
+# full-screen dimming overlays for modals, pause and win screens
+DIM_OVERLAY_160 = pygame.Surface((W,H), pygame.SRCALPHA); DIM_OVERLAY_160.fill((0,0,0,160))
+DIM_OVERLAY_210 = pygame.Surface((W,H), pygame.SRCALPHA); DIM_OVERLAY_210.fill((6,8,10,210))
+
+# ---------------- Event helpers ----------------
+def wait_events(timeout=0):
+    # block until input arrives (or timeout ms pass) instead of spinning; timeout=0 waits forever
+    first = pygame.event.wait(timeout)
+    if first.type == pygame.NOEVENT:
+        return []
+    return [first] + pygame.event.get()
+
 # ---------------- UI components ----------------
 class Button:
     def __init__(self, rect, text, primary=False):
@@ -161,14 +330,34 @@ class Button:
         self.disabled = False
         self._last_click = 0.0  # debounce
 
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        # render once per label change, not per frame
+        self._text = value
+        self._text_surf = FONT.render(value, True, (245,245,245))
+        self._tw, self._th = self._text_surf.get_size()
+
+    def _build_bgs(self):
+        size = self.rect.size
+        self._bg_normal = rounded_surface(size, (30,160,120) if self.primary else (40,44,54), radius=10)
+        self._bg_hover = rounded_surface(size, (30,160,120) if self.primary else (58,62,74), radius=10)
+        self._bg_disabled = rounded_surface(size, (40,40,45), radius=10)
+        self._bg_size = size
+
     def draw(self, surf):
+        if getattr(self, "_bg_size", None) != self.rect.size:
+            self._build_bgs()
         if self.disabled:
-            bg = (40,40,45)
+            bg = self._bg_disabled
         else:
-            bg = (30,160,120) if self.primary else ((58,62,74) if self.hover else (40,44,54))
-        rounded_rect(surf, self.rect, bg, radius=10)
-        draw_text(surf, self.text, (self.rect.x + (self.rect.width//2 - FONT.size(self.text)[0]//2),
-                                    self.rect.y + (self.rect.height//2 - FONT.size(self.text)[1]//2)))
+            bg = self._bg_hover if self.hover else self._bg_normal
+        surf.blit(bg, self.rect.topleft)
+        surf.blit(self._text_surf, (self.rect.x + (self.rect.width//2 - self._tw//2),
+                                    self.rect.y + (self.rect.height//2 - self._th//2)))
 
     def handle_event(self, event):
         if self.disabled:
@@ -184,6 +373,19 @@ class Button:
                     return True
         return False
 
+def redraw_changed_buttons(surf, buttons, drawn, bg_color):
+    """Redraw buttons whose hover differs from what is on screen; returns dirty rects."""
+    dirty = []
+    mouse_pos = pygame.mouse.get_pos()
+    for b in buttons:
+        b.hover = b.rect.collidepoint(mouse_pos)
+        if drawn.get(b) != b.hover:
+            drawn[b] = b.hover
+            surf.fill(bg_color, b.rect)
+            b.draw(surf)
+            dirty.append(b.rect)
+    return dirty
+
 class Card:
     def __init__(self, rect, player_record):
         self.rect = pygame.Rect(rect)
@@ -196,34 +398,45 @@ class Card:
         # delete button inside card
         self.del_btn = pygame.Rect(self.rect.right - 36, self.rect.top + 8, 28, 28)
         self.del_hover = False
-
-    def draw(self, surf):
-        rounded_rect(surf, self.rect, (28,30,36), radius=12)
-        if self.hover:
-            pygame.draw.rect(surf, (80,90,110), self.rect, 2, border_radius=12)
+        # static labels
+        self.name_surf = BIG.render(self.data["name"], True, (230,230,230))
+        self.meta_surf = SMALL.render(f"Added: {self.data.get('created', '')[:10]}", True, (170,170,170))
+        self.del_text_surf = SMALL.render("Del", True, (245,245,245))
+        # cached backgrounds
+        self.bg_normal = rounded_surface(self.rect.size, (28,30,36), radius=12)
+        self.bg_hover = rounded_surface(self.rect.size, (28,30,36), radius=12, border=2, border_color=(80,90,110))
+        self.del_bg = {}
+        for hov, col in ((False, (160,40,40)), (True, (200,50,50))):
+            btn = rounded_surface(self.del_btn.size, col, radius=6)
+            btn.blit(self.del_text_surf, (6, 4))
+            self.del_bg[hov] = btn
+
+    def draw(self, surf, offset=(0,0)):
+        # rect/del_btn are in content coords; offset maps them to the screen (e.g. scroll)
+        x = self.rect.x + offset[0]
+        y = self.rect.y + offset[1]
+        surf.blit(self.bg_hover if self.hover else self.bg_normal, (x, y))
         # avatar
         if self.thumb:
-            surf.blit(self.thumb, (self.rect.x + 12, self.rect.y + (self.rect.height - 80)//2))
+            surf.blit(self.thumb, (x + 12, y + (self.rect.height - 80)//2))
         else:
-            pygame.draw.circle(surf, (90,90,100), (self.rect.x + 52, self.rect.y + self.rect.height//2), 40)
+            pygame.draw.circle(surf, (90,90,100), (x + 52, y + self.rect.height//2), 40)
         # name
-        name_surf = BIG.render(self.data["name"], True, (230,230,230))
-        surf.blit(name_surf, (self.rect.x + 110, self.rect.y + 28))
-        created = self.data.get("created", "")[:10]
-        meta = SMALL.render(f"Added: {created}", True, (170,170,170))
-        surf.blit(meta, (self.rect.x + 110, self.rect.y + 64))
+        surf.blit(self.name_surf, (x + 110, y + 28))
+        surf.blit(self.meta_surf, (x + 110, y + 64))
         # delete button (icon)
-        pygame.draw.rect(surf, (200,50,50) if self.del_hover else (160,40,40), self.del_btn, border_radius=6)
-        draw_text(surf, "Del", (self.del_btn.x + 6, self.del_btn.y + 4), font=SMALL)
+        surf.blit(self.del_bg[self.del_hover], (self.del_btn.x + offset[0], self.del_btn.y + offset[1]))
 
-    def handle_event(self, event):
+    def handle_event(self, event, offset=(0,0)):
+        rect = self.rect.move(offset)
+        del_btn = self.del_btn.move(offset)
         mx,my = pygame.mouse.get_pos()
-        self.hover = self.rect.collidepoint((mx,my))
-        self.del_hover = self.del_btn.collidepoint((mx,my))
+        self.hover = rect.collidepoint((mx,my))
+        self.del_hover = del_btn.collidepoint((mx,my))
         if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-            if self.del_btn.collidepoint(event.pos):
+            if del_btn.collidepoint(event.pos):
                 return "delete"
-            if self.rect.collidepoint(event.pos):
+            if rect.collidepoint(event.pos):
                 return "select"
         return None
 
@@ -233,7 +446,7 @@ def player_select_screen(slot):
     Shows saved players, allow selecting, deleting, or creating new.
     Returns (name, img_path) or (None, None) for back.
     """
-    # load DB fresh each entry
+    # rebuild cards from the cached DB on each entry
     while True:
         players_db = load_db()
         per_row = 3
@@ -258,17 +471,21 @@ def player_select_screen(slot):
         dragging = False
         drag_last_y = 0
         running_select = True
+        drawn_view = None  # (scroll_y, hovers) currently on screen
         # loop for this screen
         while running_select:
             clock.tick(FPS)
-            for event in pygame.event.get():
+            for event in pygame.event.get() if drawn_view is None else wait_events():  # never block with a repaint pending
                 if event.type == pygame.QUIT:
                     pygame.quit(); exit()
+                if event.type == pygame.VIDEOEXPOSE:
+                    drawn_view = None
                 # button events
                 if back_btn.handle_event(event):
                     return None, None
                 if create_btn.handle_event(event):
                     # create new flow
+                    drawn_view = None  # modals draw over this screen
                     name = text_input_modal(f"Enter name for Player {slot}")
                     if not name:
                         break
@@ -293,9 +510,10 @@ def player_select_screen(slot):
                     # propagate click to cards
                     # compute positions with scroll_y
                     for c in cards:
-                        res = c.handle_event(event)
+                        res = c.handle_event(event, (0, scroll_y))
                         if res == "delete":
                             # confirm delete modal
+                            drawn_view = None
                             confirm = confirm_modal(f"Delete {c.data['name']}? This will remove their photo.")
                             if confirm:
                                 # remove file if exists
@@ -305,6 +523,7 @@ def player_select_screen(slot):
                                 except Exception:
                                     pass
                                 delete_player_record_by_photo(c.data.get("photo"))
+                                forget_avatar(c.data.get("photo"))
                                 # break to reload DB
                                 running_select = False
                                 break
@@ -320,26 +539,24 @@ def player_select_screen(slot):
                         scroll_y = min(scroll_y + 40, 0)
                     else:
                         scroll_y = max(scroll_y - 40, -10000)  # will be clamped below
+            rows = (len(cards) + per_row - 1) // per_row
+            content_h = rows * (card_h + padding)
+            min_scroll = min(0, H - margin_top - content_h - 40)
+            scroll_y = max(min_scroll, min(0, scroll_y))
+            back_btn.hover = back_btn.rect.collidepoint(pygame.mouse.get_pos())
+            create_btn.hover = create_btn.rect.collidepoint(pygame.mouse.get_pos())
+            # cards can scroll under the header, so any change repaints the whole view
+            view = (scroll_y, back_btn.hover, create_btn.hover)
+            if view == drawn_view:
+                continue
+            drawn_view = view
             # draw
             screen.fill((12,14,20))
             draw_text_center(screen, f"Select Player {slot}", 38)
-            back_btn.hover = back_btn.rect.collidepoint(pygame.mouse.get_pos())
-            create_btn.hover = create_btn.rect.collidepoint(pygame.mouse.get_pos())
             back_btn.draw(screen); create_btn.draw(screen)
             # draw cards with scroll_y
-            rows = (len(cards) + per_row - 1) // per_row
-            content_h = rows * (card_h + padding)
-            min_scroll = min(0, H - margin_top - content_h - 40)
-            scroll_y = max(min_scroll, min(0, scroll_y))
             for c in cards:
-                c.rect.y += scroll_y  # temporary adjust
-            # re-draw cards (we will revert y after drawing)
-            for c in cards:
-                c.del_btn = pygame.Rect(c.rect.right - 36, c.rect.top + 8, 28, 28)
-                c.draw(screen)
-            # revert y changes
-            for c in cards:
-                c.rect.y -= scroll_y
+                c.draw(screen, (0, scroll_y))
             # footer hint
             hint = SMALL.render("Click card to select. 'Del' to remove. Drag/scroll to view.", True, (160,160,160))
             screen.blit(hint, (W//2 - hint.get_width()//2, H-28))
@@ -350,12 +567,20 @@ def player_select_screen(slot):
 # ---------------- Modal input & confirm ----------------
 def text_input_modal(prompt):
     name = ""
-    active = True
+    box = pygame.Rect(W//2 - 320, H//2 - 80, 640, 160)
+    line_rect = pygame.Rect(box.x + 40, H//2 - 5, box.width - 80, FONT.get_linesize())
+    name_surf = FONT.render(name, True, (230,230,230))
+    drawn_line = None  # (name, caret_on) currently on screen
+    full = True
     while True:
         clock.tick(FPS)
-        for event in pygame.event.get():
+        # paint on entry, then sleep until input or the next caret blink flip (every 500ms)
+        events = pygame.event.get() if full else wait_events(timeout=500 - pygame.time.get_ticks() % 500)
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit(); exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                full = True
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN:
                     if name.strip():
@@ -364,48 +589,62 @@ def text_input_modal(prompt):
                     return None
                 elif event.key == pygame.K_BACKSPACE:
                     name = name[:-1]
+                    name_surf = FONT.render(name, True, (230,230,230))
                 else:
                     if event.unicode.isprintable() and len(name) < 18:
                         name += event.unicode
-        # draw modal
-        overlay = pygame.Surface((W,H), pygame.SRCALPHA)
-        overlay.fill((0,0,0,160))
-        screen.blit(overlay, (0,0))
-        box = pygame.Rect(W//2 - 320, H//2 - 80, 640, 160)
-        rounded_rect(screen, box, (26,28,34), radius=12)
-        draw_text_center(screen, prompt, H//2 - 40)
-        txt = FONT.render(name + ("|" if pygame.time.get_ticks() % 1000 < 500 else ""), True, (230,230,230))
-        screen.blit(txt, (box.x + 40, H//2 - 5))
-        hint = SMALL.render("Enter = OK. Esc = Cancel", True, (150,150,150))
-        screen.blit(hint, (box.x + 40, box.y + box.height - 36))
-        pygame.display.update()
+                        name_surf = FONT.render(name, True, (230,230,230))
+        # draw modal once, then only the input line
+        if full:
+            screen.blit(DIM_OVERLAY_160, (0,0))
+            rounded_rect(screen, box, (26,28,34), radius=12)
+            draw_text_center(screen, prompt, H//2 - 40)
+            hint = SMALL.render("Enter = OK. Esc = Cancel", True, (150,150,150))
+            screen.blit(hint, (box.x + 40, box.y + box.height - 36))
+        caret_on = pygame.time.get_ticks() % 1000 < 500
+        if full or drawn_line != (name, caret_on):
+            drawn_line = (name, caret_on)
+            screen.fill((26,28,34), line_rect)
+            screen.blit(name_surf, line_rect.topleft)
+            if caret_on:
+                cx = line_rect.x + name_surf.get_width() + 1
+                pygame.draw.line(screen, (230,230,230), (cx, line_rect.y + 2), (cx, line_rect.bottom - 3), 2)
+            if full:
+                pygame.display.update(); full = False
+            else:
+                pygame.display.update(line_rect)
 
 def confirm_modal(prompt):
-    global btn_ok, btn_cancel
+    btn_ok = Button((W//2 - 140, H//2 + 10, 120, 42), "Delete", primary=True)
+    btn_cancel = Button((W//2 + 20, H//2 + 10, 120, 42), "Cancel")
+    box = pygame.Rect(W//2 - 320, H//2 - 80, 640, 160)
+    drawn = {}
+    full = True
     while True:
         clock.tick(FPS)
-        for event in pygame.event.get():
+        # nothing animates here, so block until input arrives (after the first paint)
+        for event in pygame.event.get() if full else wait_events():
             if event.type == pygame.QUIT:
                 pygame.quit(); exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                full = True
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 mx,my = event.pos
                 if btn_ok.rect.collidepoint((mx,my)):
                     return True
                 if btn_cancel.rect.collidepoint((mx,my)):
                     return False
-        # draw
-        overlay = pygame.Surface((W,H), pygame.SRCALPHA); overlay.fill((0,0,0,160))
-        screen.blit(overlay,(0,0))
-        box = pygame.Rect(W//2 - 320, H//2 - 80, 640, 160)
-        rounded_rect(screen, box, (26,28,34), radius=12)
-        draw_text_center(screen, prompt, H//2 - 30, font=BIG)
-        # create buttons local
-        btn_ok = Button((W//2 - 140, H//2 + 10, 120, 42), "Delete", primary=True)
-        btn_cancel = Button((W//2 + 20, H//2 + 10, 120, 42), "Cancel")
-        btn_ok.hover = btn_ok.rect.collidepoint(pygame.mouse.get_pos())
-        btn_cancel.hover = btn_cancel.rect.collidepoint(pygame.mouse.get_pos())
-        btn_ok.draw(screen); btn_cancel.draw(screen)
-        pygame.display.update()
+        # draw once, then only buttons whose hover flipped
+        if full:
+            screen.blit(DIM_OVERLAY_160, (0,0))
+            rounded_rect(screen, box, (26,28,34), radius=12)
+            draw_text_center(screen, prompt, H//2 - 30, font=BIG)
+            drawn.clear()
+        dirty = redraw_changed_buttons(screen, (btn_ok, btn_cancel), drawn, (26,28,34))
+        if full:
+            pygame.display.update(); full = False
+        elif dirty:
+            pygame.display.update(dirty)
 
 # ---------------- Main Menu (uses Buttons properly) ----------------
 def main_menu():
@@ -414,89 +653,126 @@ def main_menu():
     settings_btn = Button((W//2 - 150, 354, 300, 54), "Settings")
     credits_btn = Button((W//2 - 150, 418, 300, 54), "Credits")
     quit_btn = Button((W//2 - 150, 482, 300, 54), "Quit")
+    buttons = (start_btn, players_btn, settings_btn, credits_btn, quit_btn)
+    drawn = {}
+    full = True
 
     while True:
         clock.tick(FPS)
-        for event in pygame.event.get():
+        for event in pygame.event.get() if full else wait_events():  # paint on entry before blocking
             if event.type == pygame.QUIT:
                 pygame.quit(); exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                full = True
             if start_btn.handle_event(event):
                 return "quick_start"
             if players_btn.handle_event(event):
                 return "player_select"
             if settings_btn.handle_event(event):
-                settings_screen()
+                settings_screen(); full = True
             if credits_btn.handle_event(event):
-                credits_screen()
+                credits_screen(); full = True
             if quit_btn.handle_event(event):
                 pygame.quit(); exit()
 
-        # draw
-        screen.fill((10,12,18))
-        draw_text_center(screen, "Blade Arena", 72)
-        mouse_pos = pygame.mouse.get_pos()
-        for b in (start_btn, players_btn, settings_btn, credits_btn, quit_btn):
-            b.hover = b.rect.collidepoint(mouse_pos)
-            b.draw(screen)
-        pygame.display.update()
+        # draw (full frame on entry, otherwise only buttons whose hover flipped)
+        if full:
+            screen.fill((10,12,18))
+            draw_text_center(screen, "Blade Arena", 72)
+            drawn.clear()
+        dirty = redraw_changed_buttons(screen, buttons, drawn, (10,12,18))
+        if full:
+            pygame.display.update(); full = False
+        elif dirty:
+            pygame.display.update(dirty)
 
 def settings_screen():
     back = Button((W//2 - 70, H - 90, 140, 44), "Back")
     sound_on = True
+    music_btn = Button((W//2 - 120, 150, 240, 50), "Music: ON")
+    drawn = {}
+    full = True
     while True:
         clock.tick(FPS)
-        for event in pygame.event.get():
+        for event in pygame.event.get() if full else wait_events():  # paint on entry before blocking
             if event.type == pygame.QUIT:
                 pygame.quit(); exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                full = True
             if back.handle_event(event):
                 return
-            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                # toggle sound by clicking the text area
-                if pygame.Rect(W//2 - 120, 150, 240, 50).collidepoint(event.pos):
-                    sound_on = not sound_on
-                    if pygame.mixer.get_init():
-                        if sound_on:
-                            pygame.mixer.music.unpause()
-                        else:
-                            pygame.mixer.music.pause()
-        screen.fill((10,10,14))
-        draw_text_center(screen, "Settings", 60)
-        draw_button(pygame.Rect(W//2 - 120, 150, 240, 50), f"Music: {'ON' if sound_on else 'OFF'}", hover=False)
-        back.hover = back.rect.collidepoint(pygame.mouse.get_pos())
-        back.draw(screen)
-        pygame.display.update()
+            if music_btn.handle_event(event):
+                sound_on = not sound_on
+                music_btn.text = f"Music: {'ON' if sound_on else 'OFF'}"
+                drawn.pop(music_btn, None)  # label changed, force redraw
+                if pygame.mixer.get_init():
+                    if sound_on:
+                        pygame.mixer.music.unpause()
+                    else:
+                        pygame.mixer.music.pause()
+        if full:
+            screen.fill((10,10,14))
+            draw_text_center(screen, "Settings", 60)
+            drawn.clear()
+        dirty = redraw_changed_buttons(screen, (music_btn, back), drawn, (10,10,14))
+        if full:
+            pygame.display.update(); full = False
+        elif dirty:
+            pygame.display.update(dirty)
 
 def credits_screen():
     back = Button((W//2 - 70, H - 90, 140, 44), "Back")
+    lines = [
+        "Made with Python, Pygame and OpenCV",
+        "Face capture + local player history",
+        "Controls: Player1 - WASD | Player2 - Arrow keys",
+        "ESC - Pause | R - Restart"
+    ]
+    line_surfs = [FONT.render(l, True, (245,245,245)) for l in lines]
+    drawn = {}
+    full = True
     while True:
         clock.tick(FPS)
-        for event in pygame.event.get():
+        for event in pygame.event.get() if full else wait_events():  # paint on entry before blocking
             if event.type == pygame.QUIT:
                 pygame.quit(); exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                full = True
             if back.handle_event(event):
                 return
-        screen.fill((10,10,14))
-        draw_text_center(screen, "Credits & Info", 60)
-        lines = [
-            "Made with Python, Pygame and OpenCV",
-            "Face capture + local player history",
-            "Controls: Player1 - WASD | Player2 - Arrow keys",
-            "ESC - Pause | R - Restart"
-        ]
-        for i,l in enumerate(lines):
-            draw_text(screen, l, (W//2 - FONT.size(l)[0]//2, 140 + i*28), font=FONT)
-        back.hover = back.rect.collidepoint(pygame.mouse.get_pos())
-        back.draw(screen)
-        pygame.display.update()
+        if full:
+            screen.fill((10,10,14))
+            draw_text_center(screen, "Credits & Info", 60)
+            for i,l in enumerate(line_surfs):
+                screen.blit(l, (W//2 - l.get_width()//2, 140 + i*28))
+            drawn.clear()
+        dirty = redraw_changed_buttons(screen, (back,), drawn, (10,10,14))
+        if full:
+            pygame.display.update(); full = False
+        elif dirty:
+            pygame.display.update(dirty)
 
 # ---------------- Game helpers & flow ----------------
 def respawn_blade():
-    return {"x": random.randint(120, W-120), "y": random.randint(160, H-120), "size": 34}
+    return {"x": random.randint(120, W-120), "y": random.randint(160, H-120), "size": BLADE_SIZE}
 
 def respawn_health():
-    return {"x": random.randint(120, W-120), "y": random.randint(160, H-120), "size": 22}
+    return {"x": random.randint(120, W-120), "y": random.randint(160, H-120), "size": HEALTH_SIZE}
+
+# numeric player state as struct-of-arrays, row i = player i
+POS = np.zeros((2, 2), dtype=np.float32)
+HP = np.zeros(2, dtype=np.float32)
+HAS_BLADE = np.zeros(2, dtype=bool)
+POS_MIN = np.array([90, 160], dtype=np.float32)
+POS_MAX = np.array([W-90, H-90], dtype=np.float32)
+# per player: (+x, -x, +y, -y)
+MOVE_KEYS = (
+    (pygame.K_d, pygame.K_a, pygame.K_s, pygame.K_w),
+    (pygame.K_RIGHT, pygame.K_LEFT, pygame.K_DOWN, pygame.K_UP),
+)
 
 def create_players(p1_name, p1_img, p2_name, p2_img):
+    """Reset POS/HP/HAS_BLADE and return the display-only player records."""
     try:
         a1 = make_circular_avatar(p1_img) if p1_img else None
     except:
@@ -507,15 +783,59 @@ def create_players(p1_name, p1_img, p2_name, p2_img):
         a2 = None
     if a1 is None:
         a1 = pygame.Surface((AVATAR_SIZE, AVATAR_SIZE), pygame.SRCALPHA); pygame.draw.circle(a1, (130,140,150), (AVATAR_SIZE//2, AVATAR_SIZE//2), AVATAR_SIZE//2)
+        a1 = a1.convert_alpha()
     if a2 is None:
         a2 = pygame.Surface((AVATAR_SIZE, AVATAR_SIZE), pygame.SRCALPHA); pygame.draw.circle(a2, (150,120,120), (AVATAR_SIZE//2, AVATAR_SIZE//2), AVATAR_SIZE//2)
+        a2 = a2.convert_alpha()
+    POS[:] = [(180, H//2), (W-180, H//2)]
+    HP[:] = 5
+    HAS_BLADE[:] = False
     return [
-        {"name": p1_name, "x": 180, "y": H//2, "hp": 5, "blade": False, "img": a1, "color": (70,150,230)},
-        {"name": p2_name, "x": W-180, "y": H//2, "hp": 5, "blade": False, "img": a2, "color": (235,80,80)}
+        {"name": p1_name, "img": a1, "_rect": a1.get_rect(), "color": (70,150,230)},
+        {"name": p2_name, "img": a2, "_rect": a2.get_rect(), "color": (235,80,80)}
     ]
 
-def dist(a,b):
-    return math.hypot(a["x"]-b["x"], a["y"]-b["y"])
+# squared pickup / hit ranges, compared against squared distances (no sqrt)
+BLADE_REACH2 = (BLADE_SIZE/1.2 + 40) ** 2
+HEALTH_REACH2 = (HEALTH_SIZE/1.2 + 40) ** 2
+COMBAT_REACH2 = 82 ** 2
+
+@njit(cache=True)
+def step(pos, hp, has_blade, bx, by, hx, hy, blade_r2, health_r2, combat_r2, dmg):
+    """Pickups and combat for N players, updating hp/has_blade in place.
+
+    Returns (took_blade, took_health) so the caller can respawn pickups.
+    The first player in range of a pickup takes it.
+    """
+    n = pos.shape[0]
+    took_blade = False
+    took_health = False
+    for i in range(n):
+        dx = pos[i, 0] - bx; dy = pos[i, 1] - by
+        if dx*dx + dy*dy < blade_r2:
+            has_blade[:] = False
+            has_blade[i] = True
+            took_blade = True
+            break
+    for i in range(n):
+        dx = pos[i, 0] - hx; dy = pos[i, 1] - hy
+        if dx*dx + dy*dy < health_r2:
+            hp[i] = min(5.0, hp[i] + 1.0)
+            took_health = True
+            break
+    for i in range(n):
+        for j in range(i + 1, n):
+            dx = pos[i, 0] - pos[j, 0]; dy = pos[i, 1] - pos[j, 1]
+            if dx*dx + dy*dy < combat_r2:
+                if has_blade[i] and not has_blade[j]:
+                    hp[j] -= dmg
+                elif has_blade[j] and not has_blade[i]:
+                    hp[i] -= dmg
+    return took_blade, took_health
+
+# compile (or load the numba cache) now on scratch arrays, not inside the first game frame
+step(np.zeros_like(POS), np.zeros_like(HP), np.zeros_like(HAS_BLADE),
+     0.0, 0.0, 0.0, 0.0, BLADE_REACH2, HEALTH_REACH2, COMBAT_REACH2, 0.09)
 
 # ---------------- Startup flow ----------------
 init_db()
@@ -561,6 +881,13 @@ health = respawn_health()
 blade_angle = 0
 paused = False
 
+# pause / win screen buttons, built once
+resume_btn = Button((W//2 - 120, 240, 240, 52), "Resume", primary=True)
+restart_btn = Button((W//2 - 120, 310, 240, 44), "Restart")
+menu_btn = Button((W//2 - 120, 370, 240, 44), "Main Menu")
+win_btn = Button((W//2 - 120, H//2 + 20, 240, 56), "Restart", primary=True)
+win_btn.hover = True
+
 # ---------------- Main game loop ----------------
 running = True
 while running:
@@ -577,12 +904,8 @@ while running:
 
     if paused:
         # simple paused overlay
-        overlay = pygame.Surface((W,H), pygame.SRCALPHA); overlay.fill((0,0,0,160))
-        screen.blit(overlay, (0,0))
+        screen.blit(DIM_OVERLAY_160, (0,0))
         draw_text_center(screen, "Paused", 140)
-        resume_btn = Button((W//2 - 120, 240, 240, 52), "Resume", primary=True)
-        restart_btn = Button((W//2 - 120, 310, 240, 44), "Restart")
-        menu_btn = Button((W//2 - 120, 370, 240, 44), "Main Menu")
         mouse_pos = pygame.mouse.get_pos()
         for b in (resume_btn, restart_btn, menu_btn):
             b.hover = b.rect.collidepoint(mouse_pos)
@@ -611,82 +934,52 @@ while running:
     # input movement
     keys = pygame.key.get_pressed()
     speed = 240 * dt
-    if keys[pygame.K_w]: players[0]["y"] -= speed
-    if keys[pygame.K_s]: players[0]["y"] += speed
-    if keys[pygame.K_a]: players[0]["x"] -= speed
-    if keys[pygame.K_d]: players[0]["x"] += speed
-    if keys[pygame.K_UP]: players[1]["y"] -= speed
-    if keys[pygame.K_DOWN]: players[1]["y"] += speed
-    if keys[pygame.K_LEFT]: players[1]["x"] -= speed
-    if keys[pygame.K_RIGHT]: players[1]["x"] += speed
+    pressed = np.array([[keys[k] for k in ks] for ks in MOVE_KEYS], dtype=np.float32)
+    POS += (pressed[:, 0::2] - pressed[:, 1::2]) * speed
 
     # clamp
-    for p in players:
-        p["x"] = max(90, min(W-90, p["x"]))
-        p["y"] = max(160, min(H-90, p["y"]))
-
-    # pickups & logic
-    for i, p in enumerate(players):
-        if dist(p, blade) < (blade["size"]/1.2 + 40):
-            p["blade"] = True
-            players[1-i]["blade"] = False
-            blade = respawn_blade()
-    for p in players:
-        if dist(p, health) < (health["size"]/1.2 + 40):
-            p["hp"] = min(5, p["hp"] + 1)
-            health = respawn_health()
-    # combat
-    if dist(players[0], players[1]) < 82:
-        if players[0]["blade"] and not players[1]["blade"]:
-            players[1]["hp"] -= 0.09
-        elif players[1]["blade"] and not players[0]["blade"]:
-            players[0]["hp"] -= 0.09
+    np.clip(POS, POS_MIN, POS_MAX, out=POS)
+
+    # pickups, logic & combat
+    took_blade, took_health = step(POS, HP, HAS_BLADE,
+                                   float(blade["x"]), float(blade["y"]), float(health["x"]), float(health["y"]),
+                                   BLADE_REACH2, HEALTH_REACH2, COMBAT_REACH2, 0.09)
+    if took_blade:
+        blade = respawn_blade()
+    if took_health:
+        health = respawn_health()
 
     # draw frame
     screen.fill((14,16,22))
     rounded_rect(screen, pygame.Rect(0,0,W,110), (20,22,28), radius=0)
     # top UI
     screen.blit(BIG.render(players[0]["name"], True, players[0]["color"]), (24, 18))
-    for i in range(int(players[0]["hp"])): draw_heart(screen, 24 + i*34 + 2, 70, 14, (235,60,60))
     name_r = BIG.render(players[1]["name"], True, players[1]["color"])
     screen.blit(name_r, (W - name_r.get_width() - 24, 18))
-    for i in range(int(players[1]["hp"])):
-        draw_heart(screen, W - (i + 1) * 34 - 24, 70, 14, (235, 60, 60))
+    hud = [(HEART_HP, pos) for i in (0, 1) for pos in HP_SLOTS[i][:max(0, int(HP[i]))]]
 
     # powerups
-    draw_heart(screen, int(health["x"]), int(health["y"]), int(health["size"]), (220,40,40))
-    draw_triangle(screen, int(blade["x"]), int(blade["y"]), int(blade["size"]), (245,245,245))
+    hud.append((HEART_PICKUP, sprite_pos(HEART_PICKUP, int(health["x"]), int(health["y"]))))
+    hud.append((BLADE_PICKUP, sprite_pos(BLADE_PICKUP, int(blade["x"]), int(blade["y"]))))
+    blit_batch(screen, hud)
 
     # aura behind (draw first)
-    blade_angle += 6
-    for p in players:
-        if p.get("blade"):
-            AURA_SIZE = 180
-            aura = pygame.Surface((AURA_SIZE, AURA_SIZE), pygame.SRCALPHA)
-            cx, cy = AURA_SIZE//2, AURA_SIZE//2
-            inner_r, outer_r = 36, 72
-            for k in range(6):
-                ang = math.radians(blade_angle + k*60)
-                dx1 = int(inner_r * math.cos(ang)); dy1 = int(inner_r * math.sin(ang))
-                dx2 = int(outer_r * math.cos(ang)); dy2 = int(outer_r * math.sin(ang))
-                pygame.draw.polygon(aura, (200,24,24,140), [(cx,cy),(cx+dx1,cy+dy1),(cx+dx2,cy+dy2)])
-            pygame.draw.circle(aura, (255,120,120,120), (cx,cy), 12)
-            aura_pos = (int(p["x"]) - cx, int(p["y"]) - cy)
-            screen.blit(aura, aura_pos)
-
-    # draw avatars on top
-    for p in players:
-        rect = p["img"].get_rect(center=(int(p["x"]), int(p["y"])))
-        screen.blit(p["img"], rect)
+    blade_angle += AURA_STEP
+    aura = AURA_FRAMES[(blade_angle // AURA_STEP) % len(AURA_FRAMES)]
+    centers = [(int(x), int(y)) for x, y in POS]
+    draws = [(aura, (cx - AURA_SIZE//2, cy - AURA_SIZE//2)) for (cx, cy), armed in zip(centers, HAS_BLADE) if armed]
+    # avatars on top
+    for p, c in zip(players, centers):
+        p["_rect"].center = c
+        draws.append((p["img"], p["_rect"]))
+    blit_batch(screen, draws)
 
     # win check
-    if players[0]["hp"] <= 0 or players[1]["hp"] <= 0:
-        winner = players[1]["name"] if players[0]["hp"] <= 0 else players[0]["name"]
-        overlay = pygame.Surface((W,H), pygame.SRCALPHA); overlay.fill((6,8,10,210))
-        screen.blit(overlay,(0,0))
+    if HP[0] <= 0 or HP[1] <= 0:
+        winner = players[1]["name"] if HP[0] <= 0 else players[0]["name"]
+        screen.blit(DIM_OVERLAY_210, (0,0))
         draw_text_center(screen, f"{winner} Wins!", H//2 - 40)
-        btn = Button((W//2 - 120, H//2 + 20, 240, 56), "Restart", primary=True)
-        btn.hover = True; btn.draw(screen)
+        win_btn.draw(screen)
         pygame.display.update()
         pygame.time.delay(1200)
         players = create_players(p1_name, p1_img, p2_name, p2_img)